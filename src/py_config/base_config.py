@@ -5,8 +5,8 @@ All classes are derived from the BaseElementCfg or BaseContainerCfg class.
 This classes have pre and post root validators that search their children
 fields and specialize them as required.
 
-The BaseElementCfg root validator that takes all the arguments and packs them into a generic
-kwargs attribute.   When specialize is called by the post validator on this object it
+BaseElementCfg takes all the arguments and packs them into a private generic
+_kwargs attribute.   When specialize is called by the post validator on this object it
 creates an object of the type specified in class_path.
 
 Example:
@@ -27,31 +27,204 @@ Example:
 
     container.item will be of type Item.
 
+    container = Container.preload_and_load(config) imports all the class_path modules
+    before validation starts.
+
     See base_config_test for a working example.
 """
+import functools
 import importlib
-import inspect
-from typing import Dict, Type, Any, Optional, List
+import sys
+import threading
+from typing import Dict, Type, Any, Optional, Callable, Tuple, Iterator, TypeVar
 
-import pydantic
-from pydantic import root_validator
+from pydantic import PrivateAttr, root_validator
+from pydantic.fields import ModelField
 from pydantic.main import BaseModel
+from pydantic.typing import ForwardRef
+from pydantic.utils import lenient_issubclass
 
 from py_config import ConfigurationError
 
 
+@functools.lru_cache(maxsize=None)
 def class_from_name(class_path: str) -> Type:
     """Get a class object for the fully qualified class_path"""
-    try:
-        module_name, class_name = class_path.rsplit(".", 1)
-    except ValueError:
+    idx = class_path.rfind(".")
+    if idx < 0:
         # Deal with the class being in the main global scope.
         module_name, class_name = "__main__", class_path
-    module = importlib.import_module(module_name)
+    else:
+        module_name, class_name = class_path[:idx], class_path[idx + 1 :]
+    # Skip the import machinery (and its lock) if the module is already loaded.
+    module = sys.modules.get(module_name) or importlib.import_module(module_name)
     cls = getattr(module, class_name)
     return cls
 
 
+# Errors from resolving a (class_path, base_cls) pair, oldest first.
+_FAILED_BUILDERS_MAXSIZE = 128
+_failed_builders: Dict[Tuple[str, Type], Exception] = dict()
+_failed_builders_lock = threading.Lock()
+
+
+def _copy_error(error: Exception) -> Optional[Exception]:
+    """
+    Copy an error without its traceback, context or cause, or None if it can't be copied.
+    __init__ isn't called as subclasses may take different arguments than they store in args.
+    """
+    try:
+        copy = type(error).__new__(type(error), *error.args)
+        copy.args = error.args
+        copy.__dict__.update(getattr(error, "__dict__", {}))
+        if isinstance(error, ImportError):
+            copy.name, copy.path = error.name, error.path
+    except Exception:
+        return None
+    return copy
+
+
+@functools.lru_cache(maxsize=None)
+def _builder_for(class_path: str, base_cls: Type) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Resolve class_path, check it specializes base_cls and return a function that builds
+    the specialized object from the kwargs.
+
+    All the lookups and checks are done once per (class_path, base_cls) pair.  Failures
+    aren't cached by lru_cache so they are remembered separately and raised again straight away.
+    """
+    key = (class_path, base_cls)
+    with _failed_builders_lock:
+        error = _failed_builders.get(key)
+    if error is not None:
+        # Fresh copy so callers don't share __context__/__cause__.
+        raise _copy_error(error) or error
+    try:
+        specialized_cls = class_from_name(class_path)
+        if not issubclass(specialized_cls, base_cls):
+            raise ConfigurationError(
+                f"Specialization '{specialized_cls}' must be a subclass of '{base_cls}'."
+            )
+    except (ImportError, AttributeError, ConfigurationError) as e:
+        # Store a copy without the traceback so the frames and raw config aren't kept alive.
+        # Errors that can't be copied just aren't remembered.
+        copy = _copy_error(e)
+        if copy is not None:
+            with _failed_builders_lock:
+                if len(_failed_builders) >= _FAILED_BUILDERS_MAXSIZE:
+                    # Drop the oldest failure.
+                    del _failed_builders[next(iter(_failed_builders))]
+                _failed_builders[key] = copy
+        raise
+
+    if specialized_cls.__trusted__:
+
+        def build(kwargs: Dict[str, Any]) -> Any:
+            return specialized_cls.construct(**kwargs)
+
+    else:
+        name = specialized_cls.__name__
+
+        def build(kwargs: Dict[str, Any]) -> Any:
+            return specialized_cls(**{_CLASS_PATH: name, **kwargs, _BASE_CLASS: False})
+
+    return build
+
+
+def _walk_class_paths(cfg: Any) -> Iterator[str]:
+    """Yield every class_path in a raw configuration of nested dicts and lists."""
+    if isinstance(cfg, dict):
+        class_path = cfg.get(_CLASS_PATH)
+        if isinstance(class_path, str):
+            yield class_path
+        for v in cfg.values():
+            yield from _walk_class_paths(v)
+    elif isinstance(cfg, list):
+        for v in cfg:
+            yield from _walk_class_paths(v)
+
+
+def preload_modules(cfg: Dict[str, Any]) -> None:
+    """
+    Import every module referenced by a class_path in the raw configuration up front so
+    the imports aren't spread through validation.
+    """
+    module_names = {
+        class_path.rsplit(".", 1)[0]
+        for class_path in _walk_class_paths(cfg)
+        if "." in class_path
+    }
+    for module_name in module_names:
+        importlib.import_module(module_name)
+
+
+def _class_cache_clear() -> None:
+    """Clear the class_path lookup caches.  Needed if modules are reloaded."""
+    class_from_name.cache_clear()
+    _builder_for.cache_clear()
+    with _failed_builders_lock:
+        _failed_builders.clear()
+
+
+# Names of the BaseElementCfg specialization fields.
+_CLASS_PATH = sys.intern("class_path")
+_BASE_CLASS = sys.intern("base_class")
+_KWARGS = sys.intern("_kwargs")
+# Fields that aren't passed through to the specialized class.
+_KWARGS_EXCLUDE = frozenset((_CLASS_PATH, _BASE_CLASS))
+
+# Values for the specialization fields once an element has been cleaned up.
+_CLEANUP_NONES = {_CLASS_PATH: None, _BASE_CLASS: None}
+
+
+def _cleanup_element(element: "BaseElementCfg") -> None:
+    """
+    Clear the specialization fields so they can be easily excluded from dumps.
+
+    Writes straight into __dict__ to skip BaseModel.__setattr__ for each field.
+    """
+    element.__dict__.update(_CLEANUP_NONES)
+    element.__fields_set__.difference_update(_CLEANUP_NONES)
+    object.__setattr__(element, _KWARGS, None)
+
+
+def _handle_list(v: list) -> None:
+    """Clean up the elements of a list field in place.  These are already specialized."""
+    for element in v:
+        if isinstance(element, BaseElementCfg):
+            _cleanup_element(element)
+
+
+def _handle_dict(v: dict) -> None:
+    """Clean up the values of a dict field in place."""
+    for element in v.values():
+        if isinstance(element, BaseElementCfg):
+            # Only clean up elements that derived from BaseElementCfg.
+            # Other dicts come through here and if things are cleaned up now
+            # kwargs and class_path won't be around when they are needed.
+            _cleanup_element(element)
+
+
+# Field value handlers keyed on the exact type of the value.
+_DISPATCH = {list: _handle_list, dict: _handle_dict}
+
+
+def _field_can_hold_element(field: ModelField) -> bool:
+    """Check if a field, or any of its List/Dict/Union sub fields, can hold a BaseElementCfg."""
+    if isinstance(field.type_, ForwardRef):
+        # Not resolved yet so we can't tell.
+        return True
+    if field.type_ is Any or lenient_issubclass(field.type_, BaseElementCfg):
+        return True
+    if lenient_issubclass(BaseElementCfg, field.type_):
+        # A base class such as BaseModel can also hold an element.
+        return True
+    return any(_field_can_hold_element(f) for f in field.sub_fields or ())
+
+
+ContainerT = TypeVar("ContainerT", bound="BaseContainerCfg")
+
+
 class BaseContainerCfg(BaseModel):
     """
     Configuration object that knows how to iterate over fields of lists and dictionaries or BaseElementCfg
@@ -64,83 +237,95 @@ class BaseContainerCfg(BaseModel):
     @root_validator
     def specialize(cls, values):
         """
-        Post validator that specializes any objects in values that are of derived from BaseElementCfg
-        and set class_name, base_class and kwargs to None so they can be easily excluded from dumps
-        of the configuration.
+        Post validator that specializes any objects derived from BaseElementCfg that weren't
+        already specialized by BaseElementCfg.validate, such as generic objects built elsewhere.
+        The elements of lists and dicts are cleaned up so class_path and base_class are None and
+        can be easily excluded from dumps of the configuration, and the private _kwargs is released.
         """
-        specialized_values = dict()
+        if not cls._has_specializable():
+            return values
         for k, v in values.items():
-            # Work through the list of values and make spacialized objects as required.
-            if isinstance(v, List):
-                # These are already specialized so all we need to do is clean them up.
-                elements = list()
-                for element in v:
-                    element.class_path = element.base_class = element.kwargs = None
-                    elements.append(element)
-                specialized_values[k] = elements
-                continue
-            if isinstance(v, Dict):
-                elements = dict()
-                for kk, element in v.items():
-                    if isinstance(element, BaseElementCfg):
-                        # Only clean up elements that derived from BaseElementCfg.
-                        # Other dicts come through here and if things are cleaned up now
-                        # kwargs and class_path won't be around when they are needed.
-                        element.class_path = element.base_class = element.kwargs = None
-                        elements[kk] = element
-                    else:
-                        elements[kk] = element
-                specialized_values[k] = elements
-                continue
-            if isinstance(v, BaseElementCfg):
-                # Regular field that needs specialization.
-                specialized_values[k] = v.specialize_field()
-                continue
-            # Just a plain old field.
-            specialized_values[k] = v
-        return specialized_values
+            # Work through the values and specialize or clean up objects in place as required.
+            handler = _DISPATCH.get(type(v))
+            if handler:
+                handler(v)
+            elif isinstance(v, BaseElementCfg) and v._kwargs is not None:
+                # Generic object that wasn't specialized from the raw arguments by validate.
+                values[k] = v.specialize_field()
+        return values
+
+    @classmethod
+    def preload_and_load(cls: Type[ContainerT], cfg: Dict[str, Any]) -> ContainerT:
+        """Import all the modules referenced in cfg and then create the configuration object."""
+        preload_modules(cfg)
+        return cls(**cfg)
+
+    @classmethod
+    def _has_specializable(cls) -> bool:
+        """
+        Check if any of the fields can hold a BaseElementCfg.  If none can specialize is a no-op.
+
+        Worked out on first use rather than in __init_subclass__ as BaseElementCfg doesn't exist
+        yet when it is itself created.
+        """
+        has_specializable = cls.__dict__.get("_has_specializable_fields")
+        if has_specializable is None:
+            has_specializable = any(
+                _field_can_hold_element(f) for f in cls.__fields__.values()
+            )
+            cls._has_specializable_fields = has_specializable
+        return has_specializable
 
 
 class BaseElementCfg(BaseContainerCfg):
     """Base class for all configuration classes that can be specialized."""
 
+    # Set to True on a specialized class to build it with construct() and skip validation.
+    # Only safe when the configuration is known to be valid and has no nested elements
+    # that need specializing.
+    __trusted__ = False
+
     # Actually required, but optional so we can delete.
     class_path: Optional[str] = None
     # Marker for clean up.   It's existance is the trigger.
     base_class: Optional[bool] = None
     # Temporary storage of all the arguments for the specialized class when it is constructed
-    # in the post validator.
-    kwargs: Dict[str, Any] = None
+    # by the container's post validator.  Private so it is never validated or dumped.
+    _kwargs: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def __init__(__pydantic_self__, **data: Any) -> None:
+        # Hack to know if this is the specialization object.  If not hold on to the arguments.
+        kwargs = None
+        if _BASE_CLASS not in data:
+            kwargs = {k: v for k, v in data.items() if k not in _KWARGS_EXCLUDE}
+        super().__init__(**data)
+        object.__setattr__(__pydantic_self__, _KWARGS, kwargs)
 
     @root_validator(pre=True)
     def args_to_kwargs(cls, values):
-        """Pack the arguments into kwargs so that the BaseConfig object can be instantiated."""
-        if "class_path" not in values:
+        """Check for class_path and drop the specialization marker fields from the specialized object."""
+        if _CLASS_PATH not in values:
             raise ConfigurationError(
                 "'class_path' is required for configurable object."
             )
         # Hack to know if this is the specialization object, and can delete fields
-        if "base_class" not in values:
-            values["kwargs"] = {
-                k: v for k, v in values.items() if k not in ["class_path", "base_class"]
-            }
-        else:
-            del values["base_class"]
-            del values["class_path"]
+        if _BASE_CLASS in values:
+            del values[_BASE_CLASS]
+            del values[_CLASS_PATH]
         return values
 
+    @classmethod
+    def validate(cls, value: Any) -> "BaseElementCfg":
+        """
+        Field validation for values declared as this class.  Raw values with a class_path are
+        built straight as the specialization.  pydantic calls this for each element of List and
+        Dict fields, so errors keep the element's location.
+        """
+        if type(value) is dict and _CLASS_PATH in value:
+            kwargs = {k: v for k, v in value.items() if k not in _KWARGS_EXCLUDE}
+            return _builder_for(value[_CLASS_PATH], cls)(kwargs)
+        return super().validate(value)
+
     def specialize_field(self):
         """Convert the BaseCfg object to a specialized config object."""
-        specialized_cls = class_from_name(self.class_path)
-        if self.__class__ not in inspect.getmro(specialized_cls):
-            raise ConfigurationError(
-                f"Specialization '{specialized_cls}' must be a subclass of '{self.__class__}'."
-            )
-        # This will implicitly drop the kwargs field in the specialized class as we don't pass it.
-        args = {
-            "class_path": specialized_cls.__name__,
-            **self.kwargs,
-            "base_class": False,
-        }
-        obj = pydantic.parse_obj_as(specialized_cls, args)
-        return obj
+        return _builder_for(self.class_path, type(self))(self._kwargs)
@@ -1,9 +1,16 @@
-from typing import List, Dict
+import importlib
+from typing import Any, List, Dict
 
 import pytest
+from pydantic import ValidationError
 
 from py_config import ConfigurationError
-from py_config.base_config import BaseElementCfg, BaseContainerCfg
+from py_config.base_config import (
+    BaseElementCfg,
+    BaseContainerCfg,
+    class_from_name,
+    _class_cache_clear,
+)
 
 
 class BaseItem(BaseElementCfg):
@@ -99,8 +106,8 @@ def test_dict():
     print()
     cfg = {
         "items": {
-            "a": {"class_path": "p_test.Item", "arg1": "arg1.1"},
-            "b": {"class_path": "p_test.Item", "arg1": "arg1.2"},
+            "a": {"class_path": "base_config_test.Item1", "arg1": "arg1.1"},
+            "b": {"class_path": "base_config_test.Item1", "arg1": "arg1.2"},
         },
     }
     c = ContainerDict(**cfg)
@@ -108,3 +115,247 @@ def test_dict():
     print(c.json(indent=2))
     assert c.items["a"].arg1 == "arg1.1"
     assert c.items["b"].arg1 == "arg1.2"
+
+
+def test_class_from_name_cached():
+    _class_cache_clear()
+    assert class_from_name("base_config_test.Item1") is Item1
+    assert class_from_name("base_config_test.Item1") is Item1
+    assert class_from_name.cache_info().hits == 1
+
+
+class TrustedItem(BaseItem):
+    __trusted__ = True
+    arg1: int
+
+
+def test_trusted():
+    # Trusted classes are constructed without validation so the str isn't coerced.
+    c = ContainerX(**{"item": {"class_path": "base_config_test.TrustedItem", "arg1": "1"}})
+    assert isinstance(c.item, TrustedItem)
+    assert c.item.arg1 == "1"
+
+
+class ContainerScalarList(BaseContainerCfg):
+    names: List[str]
+    item: BaseItem
+
+
+def test_scalar_list():
+    cfg = {
+        "names": ["a", "b"],
+        "item": {"class_path": "base_config_test.Item1", "arg1": "arg1"},
+    }
+    c = ContainerScalarList(**cfg)
+    assert c.names == ["a", "b"]
+    assert isinstance(c.item, Item1)
+
+
+def test_has_specializable():
+    assert ContainerCfg._has_specializable()
+    assert ContainerList._has_specializable()
+    assert ContainerDict._has_specializable()
+    assert not Item1._has_specializable()
+    assert not BaseElementCfg._has_specializable()
+
+
+def test_list_cleanup():
+    cfg = {"items": [{"class_path": "base_config_test.Item1", "arg1": "arg1.1"}]}
+    c = ContainerList(**cfg)
+    assert c.items[0].class_path is None
+    assert c.items[0]._kwargs is None
+    assert c.items[0].dict(exclude_unset=True) == {"arg1": "arg1.1"}
+
+
+def test_generic_instance():
+    # Already built generic objects are still specialized by the post validator.
+    item = BaseItem(class_path="base_config_test.Item1", arg1="arg1")
+    c = ContainerX(item=item)
+    assert isinstance(c.item, Item1)
+    assert c.item.run() == "arg1"
+
+
+def test_not_subclass_cached():
+    _class_cache_clear()
+    args = {"item": {"class_path": "base_config_test.ItemX", "arg1": "arg1"}}
+    for _ in range(2):
+        with pytest.raises(ConfigurationError):
+            ContainerX(**args)
+    # The second attempt fails before looking up the class again.
+    info = class_from_name.cache_info()
+    assert (info.hits, info.misses) == (0, 1)
+
+
+def test_missing_module():
+    args = {"item": {"class_path": "missing_module.Item1", "arg1": "arg1"}}
+    for _ in range(2):
+        with pytest.raises(ImportError):
+            ContainerX(**args)
+
+
+class ContainerBaseList(BaseContainerCfg):
+    items: List[BaseItem]
+
+
+def test_preload_and_load(monkeypatch):
+    _class_cache_clear()
+    imported = list()
+    import_module = importlib.import_module
+
+    def record_import(name):
+        imported.append(name)
+        return import_module(name)
+
+    monkeypatch.setattr(importlib, "import_module", record_import)
+    cfg = {
+        "items": [
+            {"class_path": "base_config_test.Item1", "arg1": "arg1.1"},
+            {"class_path": "base_config_test.Item2", "arg1": "arg1.2", "arg2": "arg2"},
+        ]
+    }
+    c = ContainerBaseList.preload_and_load(cfg)
+    # Imported once up front, the class lookups find it already loaded.
+    assert imported == ["base_config_test"]
+    assert [type(item) for item in c.items] == [Item1, Item2]
+    assert c.items[1].arg1 == "arg1.2"
+
+
+def test_list_specialized():
+    cfg = {
+        "items": [
+            {"class_path": "base_config_test.Item1", "arg1": "arg1.1"},
+            {"class_path": "base_config_test.Item2", "arg1": "arg1.2", "arg2": "arg2"},
+            {"class_path": "base_config_test.Item1", "arg1": "arg1.3"},
+        ]
+    }
+    c = ContainerBaseList(**cfg)
+    assert [type(item) for item in c.items] == [Item1, Item2, Item1]
+    assert c.items[1].run() == {"arg1": "arg1.2", "arg2": "arg2"}
+
+
+class ContainerBaseDict(BaseContainerCfg):
+    items: Dict[str, BaseItem]
+
+
+def test_dict_specialized():
+    cfg = {
+        "items": {
+            "a": {"class_path": "base_config_test.Item1", "arg1": "arg1.1"},
+            "b": {"class_path": "base_config_test.Item2", "arg1": "arg1.2", "arg2": "arg2"},
+        }
+    }
+    c = ContainerBaseDict(**cfg)
+    assert isinstance(c.items["a"], Item1)
+    assert isinstance(c.items["b"], Item2)
+
+
+def test_concrete_list_dispatched():
+    # Lists of a concrete class are specialized to the class_path subclass too.
+    cfg = {
+        "items": [
+            {"class_path": "base_config_test.Item1", "arg1": "arg1.1"},
+            {"class_path": "base_config_test.Item2", "arg1": "arg1.2", "arg2": "arg2"},
+        ]
+    }
+    c = ContainerList(**cfg)
+    assert [type(item) for item in c.items] == [Item1, Item2]
+
+
+class NamedBase(BaseElementCfg):
+    name: str = "x"
+
+
+class NamedItem(NamedBase):
+    arg1: str
+
+
+class ContainerNamed(BaseContainerCfg):
+    items: List[NamedBase]
+    one: NamedBase
+
+
+def test_base_with_field_dispatched():
+    item = {"class_path": "base_config_test.NamedItem", "arg1": "arg1"}
+    c = ContainerNamed(items=[item], one=item)
+    assert type(c.items[0]) is NamedItem
+    assert type(c.one) is NamedItem
+
+
+def test_list_error_location():
+    cfg = {
+        "items": [
+            {"class_path": "base_config_test.Item1", "arg1": "arg1.1"},
+            {"class_path": "base_config_test.Item1"},
+        ]
+    }
+    with pytest.raises(ValidationError) as e:
+        ContainerBaseList(**cfg)
+    assert e.value.errors()[0]["loc"] == ("items", 1, "arg1")
+
+
+def test_specialize_pass_through():
+    values = {"arg1": "arg1"}
+    assert Item1.specialize(values) is values
+    values = {"item": ContainerX(item={"class_path": "base_config_test.Item1", "arg1": "arg1"}).item}
+    assert ContainerX.specialize(values) is values
+
+
+class ContainerAny(BaseContainerCfg):
+    item: Any
+
+
+class ContainerBaseModel(BaseContainerCfg):
+    item: BaseContainerCfg
+
+
+def test_generic_instance_in_wide_field():
+    for container_cls in (ContainerAny, ContainerBaseModel):
+        assert container_cls._has_specializable()
+        item = BaseItem(class_path="base_config_test.Item1", arg1="arg1")
+        c = container_cls(item=item)
+        assert isinstance(c.item, Item1)
+
+
+def test_failed_lookup_not_shared():
+    _class_cache_clear()
+    args = {"item": {"class_path": "base_config_test.ItemX", "arg1": "arg1"}}
+    errors = list()
+    for _ in range(2):
+        with pytest.raises(ConfigurationError) as e:
+            ContainerX(**args)
+        errors.append(e.value)
+    assert errors[0] is not errors[1]
+    assert str(errors[0]) == str(errors[1])
+
+
+class PluginImportError(ImportError):
+    def __init__(self, module, why):
+        super().__init__(f"{module}: {why}", name=module)
+        self.why = why
+
+
+def test_custom_import_error(monkeypatch):
+    _class_cache_clear()
+
+    imported = list()
+
+    def import_module(name):
+        imported.append(name)
+        raise PluginImportError(name, "broken")
+
+    monkeypatch.setattr(importlib, "import_module", import_module)
+    args = {"item": {"class_path": "badplug.Item1", "arg1": "arg1"}}
+    for _ in range(2):
+        with pytest.raises(PluginImportError) as e:
+            ContainerX(**args)
+        assert str(e.value) == "badplug: broken"
+        assert e.value.name == "badplug"
+        assert e.value.why == "broken"
+    # The second attempt is raised from the failure cache.
+    assert imported == ["badplug"]
+
+
+def test_single_field_error_location():
+    with pytest.raises(ValidationError) as e:
+        ContainerX(item={"class_path": "base_config_test.Item1"})
+    assert e.value.errors()[0]["loc"] == ("item", "arg1")